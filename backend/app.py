@@ -2,7 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Import routers correctly (NO 'backend.' prefix)
@@ -13,9 +15,19 @@ from routes.phonation_test import router as phonation_router
 from routes.sz_ratio import router as sz_router
 from routes.rate_of_speech import router as rate_of_speech_router
 from routes.articulation_screener import router as articulation_screener_router
+from routes.resonance import router as resonance_router
+from routes.health import router as health_router, warm_up
+from core.profiling import install_profiling
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers immediately and /ready flips when done
+    asyncio.get_running_loop().run_in_executor(None, warm_up)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware FIRST (before route registration)
 app.add_middleware(
@@ -26,7 +38,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (no-op unless PROFILE_ADMIN_TOKEN or PROFILE_SAMPLE_RATE is set)
+install_profiling(app)
+
 # Register API routes
+app.include_router(health_router)
 app.include_router(general_router, prefix="/api/analyze")
 app.include_router(vowel_router, prefix="/api/analyze")
 app.include_router(pataka_router, prefix="/api/analyze")
@@ -34,6 +50,7 @@ app.include_router(phonation_router, prefix="/phonation")
 app.include_router(sz_router, prefix="/api/sz")
 app.include_router(rate_of_speech_router, prefix="/api/analyze")
 app.include_router(articulation_screener_router, prefix="/api/analyze")
+app.include_router(resonance_router, prefix="/api/analyze")
 
 
 # Serve static frontend files AFTER all API routes
@@ -42,8 +59,20 @@ if frontend_dist.exists():
     app.mount("/", StaticFiles(directory=str(frontend_dist), html=True), name="static")
 
 
+def default_worker_count() -> int:
+    """One worker per CPU available to this process (respects container affinity)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
-    port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    if os.getenv("SERVE_MODE", "single") == "production":
+        # Pre-fork workers; they share caches through core.shared_cache
+        workers = int(os.getenv("WEB_WORKERS", 0)) or default_worker_count()
+        uvicorn.run("app:app", host="0.0.0.0", port=port, workers=workers,
+                    app_dir=str(Path(__file__).parent))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
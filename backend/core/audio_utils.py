@@ -0,0 +1,148 @@
+"""
+Shared audio helpers for the analysis routes.
+Incoming PCM is brought to a fixed analysis rate before any feature extraction,
+so frame sizes and FFT lengths mean the same thing regardless of browser sample rate.
+
+Samples are kept as compact int16 PCM in buffers and caches; DSP kernels convert
+to float32 themselves, one block at a time. Requests using the audio_pcm16 transport
+(base64 int16) avoid materializing a list of Python floats; the legacy audio_data
+JSON arrays are still parsed into one by pydantic before they reach decode_pcm.
+"""
+
+import base64
+import os
+from functools import lru_cache
+from math import ceil, gcd
+from typing import Iterator, List, Optional
+
+import numpy as np
+from scipy import signal
+
+from core.shared_cache import shared_cache
+
+# Rate used for all DSP (pauses, spectra). Waveforms for display keep the original rate.
+ANALYSIS_SAMPLE_RATE = int(os.getenv("ANALYSIS_SAMPLE_RATE", 16000))
+
+# Storage format for PCM buffers and the float32 block size used by DSP kernels
+PCM_DTYPE = np.int16
+PCM_SCALE = 32768.0
+DSP_BLOCK_SIZE = 65536
+
+
+def decode_pcm(audio_data: Optional[List[float]] = None, audio_pcm16: Optional[str] = None) -> np.ndarray:
+    """
+    Decode request audio into a compact int16 buffer
+
+    Args:
+        audio_data: Float samples in [-1, 1] (legacy JSON transport)
+        audio_pcm16: Base64 little-endian int16 PCM (compact transport, preferred)
+
+    Returns:
+        int16 PCM array
+    """
+    if audio_pcm16:
+        return np.frombuffer(base64.b64decode(audio_pcm16), dtype="<i2").astype(PCM_DTYPE, copy=False)
+
+    pcm = np.empty(len(audio_data or []), dtype=PCM_DTYPE)
+    for start in range(0, len(pcm), DSP_BLOCK_SIZE):
+        block = np.asarray(audio_data[start:start + DSP_BLOCK_SIZE], dtype=np.float32)
+        np.clip(np.rint(block * (PCM_SCALE - 1)), -PCM_SCALE, PCM_SCALE - 1, out=block)
+        pcm[start:start + len(block)] = block
+    return pcm
+
+
+def pcm_to_float(pcm: np.ndarray) -> np.ndarray:
+    """float32 samples in [-1, 1] for an int16 (or float) PCM block"""
+    if pcm.dtype == PCM_DTYPE:
+        return pcm.astype(np.float32) * np.float32(1.0 / PCM_SCALE)
+    return pcm.astype(np.float32, copy=False)
+
+
+def float_to_pcm(audio: np.ndarray) -> np.ndarray:
+    """Quantize float samples in [-1, 1] to int16 PCM"""
+    return np.clip(np.rint(audio * (PCM_SCALE - 1)), -PCM_SCALE, PCM_SCALE - 1).astype(PCM_DTYPE)
+
+
+def iter_float_blocks(pcm: np.ndarray, block_size: int = DSP_BLOCK_SIZE) -> Iterator[np.ndarray]:
+    """Yield consecutive float32 blocks of a PCM buffer"""
+    for start in range(0, len(pcm), block_size):
+        yield pcm_to_float(pcm[start:start + block_size])
+
+
+@lru_cache(maxsize=16)
+def _polyphase_ratio(sample_rate: int, target_rate: int) -> tuple[int, int]:
+    """Reduced up/down factors for resampling sample_rate -> target_rate"""
+    divisor = gcd(sample_rate, target_rate)
+    return target_rate // divisor, sample_rate // divisor
+
+
+def to_analysis_rate(audio_array: np.ndarray, sample_rate: int, target_rate: int = None) -> tuple[np.ndarray, int]:
+    """
+    Anti-alias and decimate audio to the analysis sample rate
+
+    Uses a polyphase FIR (scipy.signal.resample_poly), which only evaluates the
+    output samples that are kept. Audio already at or below the target rate is
+    returned unchanged; it is never upsampled.
+
+    int16 input is filtered in float32 blocks (with enough overlap that block
+    edges match a whole-signal pass) and returned as int16.
+
+    Args:
+        audio_array: Audio waveform at its original rate
+        sample_rate: Original sample rate in Hz
+        target_rate: Analysis rate in Hz (defaults to ANALYSIS_SAMPLE_RATE)
+
+    Returns:
+        Tuple of (analysis_audio, analysis_sample_rate)
+    """
+    target_rate = target_rate or ANALYSIS_SAMPLE_RATE
+    if sample_rate <= target_rate or len(audio_array) == 0:
+        return audio_array, sample_rate
+
+    up, down = _polyphase_ratio(int(sample_rate), int(target_rate))
+    if audio_array.dtype != PCM_DTYPE:
+        decimated = signal.resample_poly(audio_array, up, down)
+        return decimated.astype(np.float32, copy=False), target_rate
+
+    # Block boundaries fall on multiples of `down` so each maps to an exact output index;
+    # the overlap covers resample_poly's default filter half-length (10 * max(up, down) taps at up-rate).
+    overlap = down * ceil((10 * max(up, down) / up + 1) / down)
+    step = down * max(1, DSP_BLOCK_SIZE // down)
+    n_out = -(-len(audio_array) * up // down)
+    out = np.empty(n_out, dtype=PCM_DTYPE)
+
+    for start in range(0, len(audio_array), step):
+        lo = max(0, start - overlap)
+        hi = min(len(audio_array), start + step + overlap)
+        block = signal.resample_poly(pcm_to_float(audio_array[lo:hi]), up, down)
+        first = (start - lo) * up // down
+        out_start = start * up // down
+        count = min(step * up // down, n_out - out_start)
+        out[out_start:out_start + count] = float_to_pcm(block[first:first + count])
+
+    return out, target_rate
+
+
+def cached_analysis_audio(audio_array: np.ndarray, sample_rate: int, key: str) -> tuple[np.ndarray, int]:
+    """
+    to_analysis_rate backed by the shared worker cache
+
+    Args:
+        audio_array: Audio waveform at its original rate
+        sample_rate: Original sample rate in Hz
+        key: audio_key of the original audio
+
+    Returns:
+        Tuple of (analysis_audio, analysis_sample_rate); cached arrays are read-only
+    """
+    if sample_rate <= ANALYSIS_SAMPLE_RATE:
+        return audio_array, sample_rate
+
+    namespace = f"audio{ANALYSIS_SAMPLE_RATE}"
+    cached = shared_cache.get_array(namespace, key)
+    if cached is not None:
+        return cached, ANALYSIS_SAMPLE_RATE
+
+    analysis_audio, analysis_sr = to_analysis_rate(audio_array, sample_rate)
+    shared_cache.put_array(namespace, key, analysis_audio)
+    return analysis_audio, analysis_sr
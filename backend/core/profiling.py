@@ -0,0 +1,188 @@
+"""
+On-demand request profiling for the analysis endpoints.
+A request is profiled when it carries the admin header (X-Profile-Token matching
+PROFILE_ADMIN_TOKEN) or is picked by PROFILE_SAMPLE_RATE. Results are written to
+PROFILE_DIR as a metadata JSON file plus either a folded-stack file (sampling mode,
+ready for flamegraph.pl / speedscope) or a cProfile .prof dump (deterministic mode).
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+PROFILE_HEADER = b"x-profile-token"
+
+# Only one profile may run per process: overlapping cProfile.enable() calls replace
+# each other's profiler, and overlapping samplers would attribute stacks to both.
+_profile_active = threading.Lock()
+
+
+class StackSampler:
+    """Samples the Python stack of one thread at a fixed interval and folds it"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """Collapsed stacks, one 'frame;frame;frame count' line per stack"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles selected requests
+
+    Requests that are not selected pass straight through after a header scan
+    and one random draw, so the cost when disabled is negligible. Selected
+    requests that arrive while another profile is running are not profiled.
+    """
+
+    def __init__(self, app, directory: str, sample_rate: float = 0.0, admin_token: str = None,
+                 mode: str = "sampling", path_prefixes: tuple = ("/api/", "/phonation/")):
+        if mode not in ("sampling", "deterministic"):
+            raise ValueError(f"Invalid profiling mode: {mode}")
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token.encode() if admin_token else None
+        self.mode = mode
+        self.path_prefixes = path_prefixes
+
+    def _should_profile(self, scope) -> bool:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            return False
+        if self.admin_token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER and value == self.admin_token:
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if not self._should_profile(scope) or not _profile_active.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            _profile_active.release()
+
+    async def _profile(self, scope, receive, send):
+        """Run one request under the profiler and write the result"""
+        payload_bytes = 0
+        status_code = None
+
+        async def counting_receive():
+            nonlocal payload_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                payload_bytes += len(message.get("body", b""))
+            return message
+
+        async def recording_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Both profilers see the whole event loop thread, so other requests
+        # running concurrently on this worker may appear in the profile.
+        if self.mode == "sampling":
+            profiler = StackSampler(threading.get_ident())
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, recording_send)
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.mode == "sampling":
+                profiler.stop()
+            else:
+                profiler.disable()
+            self._write(profiler, scope, payload_bytes, status_code, elapsed)
+
+    def _write(self, profiler, scope, payload_bytes: int, status_code: int, elapsed: float):
+        """Store the profile and its metadata under the profile directory"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            route = scope["path"].strip("/").replace("/", "_") or "root"
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}_{route}_{uuid.uuid4().hex[:8]}"
+
+            meta = {
+                "route": scope["path"],
+                "method": scope["method"],
+                "payload_bytes": payload_bytes,
+                "status_code": status_code,
+                "duration_ms": round(elapsed * 1000, 1),
+                "mode": self.mode,
+            }
+
+            if self.mode == "sampling":
+                (self.directory / f"{name}.folded").write_text(profiler.folded())
+                meta["samples"] = sum(profiler.stacks.values())
+            else:
+                profiler.dump_stats(str(self.directory / f"{name}.prof"))
+                summary = io.StringIO()
+                pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(30)
+                (self.directory / f"{name}.txt").write_text(summary.getvalue())
+
+            (self.directory / f"{name}.json").write_text(json.dumps(meta, indent=2))
+        except Exception as e:
+            print(f"profiling write error: {e}")
+
+
+def install_profiling(app):
+    """
+    Add ProfilingMiddleware to the app when enabled by environment variables
+
+    PROFILE_ADMIN_TOKEN: profile requests sending this value in X-Profile-Token
+    PROFILE_SAMPLE_RATE: fraction of analysis requests to profile (default 0)
+    PROFILE_MODE: "sampling" (default) or "deterministic"
+    PROFILE_DIR: output directory (default backend/profiles)
+    """
+    admin_token = os.getenv("PROFILE_ADMIN_TOKEN") or None
+    sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+    if admin_token is None and sample_rate <= 0:
+        return
+
+    directory = os.getenv("PROFILE_DIR", str(Path(__file__).parent.parent / "profiles"))
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=directory,
+        sample_rate=sample_rate,
+        admin_token=admin_token,
+        mode=os.getenv("PROFILE_MODE", "sampling"),
+    )
@@ -0,0 +1,270 @@
+"""
+File-backed cache shared by all server workers.
+Entries live in SHARED_CACHE_DIR (a disk-backed temp directory by default), so every
+worker process sees the same decoded audio and results instead of holding its own
+copy. Arrays are stored as .npy and memory-mapped on read, letting workers share
+the pages through the OS page cache.
+
+Screener session state lives in its own store (SESSION_STORE_DIR, tmpfs under
+/dev/shm when available) so audio churn can never fill the filesystem it is on.
+Unless set explicitly, each size limit is capped at a fraction of the free space
+on its filesystem.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows dev servers run a single process
+    fcntl = None
+
+
+# Share of a filesystem's free space a store may use when its size is not configured
+FREE_SPACE_FRACTION = 0.25
+
+
+def _default_cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "dysarthria-slp-cache")
+
+
+def _default_session_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "dysarthria-slp-sessions")
+
+
+def _size_limit(env_name: str, default_mb: float, directory: str) -> int:
+    """
+    Byte limit for a store: the env value if set, otherwise default_mb capped
+    at FREE_SPACE_FRACTION of the free space on the directory's filesystem
+    """
+    if os.getenv(env_name) is not None:
+        return int(float(os.getenv(env_name)) * 1024 * 1024)
+
+    limit = int(default_mb * 1024 * 1024)
+    path = directory
+    while not os.path.exists(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+    try:
+        stat = os.statvfs(path)
+    except (AttributeError, OSError):  # no statvfs on Windows
+        return limit
+    return min(limit, int(stat.f_bavail * stat.f_frsize * FREE_SPACE_FRACTION))
+
+
+def audio_key(audio_array: np.ndarray, sample_rate: int, *extra) -> str:
+    """
+    Content hash identifying an audio buffer (plus any extra parameters)
+
+    Args:
+        audio_array: Audio waveform
+        sample_rate: Sample rate in Hz
+        extra: Additional values that change the cached result (e.g. assessment type)
+
+    Returns:
+        Hex digest usable as a cache key
+    """
+    digest = hashlib.sha256(np.ascontiguousarray(audio_array).view(np.uint8))
+    digest.update(f"|{audio_array.dtype}|{sample_rate}|{'|'.join(map(str, extra))}".encode())
+    return digest.hexdigest()
+
+
+class SharedFileCache:
+    """
+    Cross-process cache of numpy arrays and JSON results
+
+    Writes go to a temporary file followed by os.replace, so readers in other
+    workers never observe partial entries. Size is bounded best-effort by
+    evicting the least recently written entries, every PRUNE_EVERY writes or
+    once an eighth of max_bytes has been written, and on ENOSPC.
+
+    With strict=True, failed writes raise OSError instead of being logged and
+    dropped; use it for state that must not be lost silently.
+    """
+
+    PRUNE_EVERY = 32
+    # Lock files without an entry are removed by prune once they are this old (seconds)
+    LOCK_GRACE_SEC = 60
+
+    def __init__(self, directory: str, max_bytes: int, strict: bool = False):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.strict = strict
+        self._puts = 0
+        self._bytes_since_prune = 0
+        self._thread_lock = threading.Lock()
+        if self.enabled:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"shared cache disabled: {e}")
+                self.max_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, namespace: str, key: str, suffix: str) -> Path:
+        return self.directory / f"{namespace}-{key}{suffix}"
+
+    def _write_once(self, path: Path, write) -> int:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+                size = f.tell()
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return size
+
+    def _atomic_write(self, path: Path, write):
+        try:
+            size = self._write_once(path, write)
+        except OSError as e:
+            if e.errno != errno.ENOSPC:
+                raise
+            # Filesystem full: evict and retry once
+            self.prune(target_bytes=self.max_bytes // 2)
+            size = self._write_once(path, write)
+
+        self._puts += 1
+        self._bytes_since_prune += size
+        if self._puts % self.PRUNE_EVERY == 0 or self._bytes_since_prune >= self.max_bytes // 8:
+            self.prune()
+
+    def get_array(self, namespace: str, key: str) -> Optional[np.ndarray]:
+        """Memory-mapped, read-only array for key, or None"""
+        if not self.enabled:
+            return None
+        try:
+            return np.load(self._path(namespace, key, ".npy"), mmap_mode="r")
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+    def put_array(self, namespace: str, key: str, array: np.ndarray):
+        if not self.enabled:
+            return
+        try:
+            self._atomic_write(self._path(namespace, key, ".npy"), lambda f: np.save(f, array))
+        except OSError as e:
+            if self.strict:
+                raise
+            print(f"shared cache write error: {e}")
+
+    def get_json(self, namespace: str, key: str):
+        """Decoded JSON value for key, or None"""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(namespace, key, ".json"), "rb") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+    def put_json(self, namespace: str, key: str, value):
+        if not self.enabled:
+            return
+        data = json.dumps(value).encode()
+        try:
+            self._atomic_write(self._path(namespace, key, ".json"), lambda f: f.write(data))
+        except OSError as e:
+            if self.strict:
+                raise
+            print(f"shared cache write error: {e}")
+
+    def delete(self, namespace: str, key: str):
+        """Remove an entry (array and/or JSON) and its lock file"""
+        for path in (self._path(namespace, key, ".npy"), self._path(namespace, key, ".json"),
+                     self.directory / f".lock-{namespace}-{key}"):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    @contextmanager
+    def lock(self, namespace: str, key: str):
+        """Exclusive lock on one entry across worker processes, for read-modify-write updates"""
+        with self._thread_lock:
+            if fcntl is None or not self.enabled:
+                yield
+                return
+            with open(self.directory / f".lock-{namespace}-{key}", "ab") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def prune(self, target_bytes: int = None):
+        """
+        Evict oldest entries until the directory fits in target_bytes (default max_bytes),
+        then remove lock files left behind by entries that no longer exist
+        """
+        target_bytes = self.max_bytes if target_bytes is None else target_bytes
+        self._bytes_since_prune = 0
+        try:
+            entries = []
+            locks = []
+            for entry in os.scandir(self.directory):
+                if not entry.is_file():
+                    continue
+                if entry.name.startswith(".lock-"):
+                    locks.append((entry.stat().st_mtime, entry.name))
+                elif not entry.name.startswith("."):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= target_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+        self._prune_locks(locks)
+
+    def _prune_locks(self, locks: list):
+        """Unlink idle lock files whose entry is gone (evicted or never finalized)"""
+        cutoff = time.time() - self.LOCK_GRACE_SEC
+        for mtime, name in locks:
+            stem = name[len(".lock-"):]
+            if mtime > cutoff or any((self.directory / f"{stem}{suffix}").exists() for suffix in (".json", ".npy")):
+                continue
+            path = self.directory / name
+            try:
+                with open(path, "rb") as f:
+                    if fcntl is not None:
+                        # Skip locks another worker is holding right now
+                        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    os.unlink(path)
+            except OSError:
+                pass
+
+
+_cache_dir = os.getenv("SHARED_CACHE_DIR", _default_cache_dir())
+shared_cache = SharedFileCache(_cache_dir, _size_limit("SHARED_CACHE_MAX_MB", 256, _cache_dir))
+
+# Incremental session state (small JSON aggregates), on a separate directory and
+# (by default) a separate filesystem so audio/result churn cannot evict or starve it
+_session_dir = os.getenv("SESSION_STORE_DIR", _default_session_dir())
+session_store = SharedFileCache(
+    _session_dir,
+    _size_limit("SESSION_STORE_MAX_MB", 16, _session_dir),
+    strict=True,
+)
@@ -0,0 +1,75 @@
+"""
+Batched STFT band-energy analysis.
+Band definitions are turned once into a (bands x bins) filterbank matrix, cached per
+(sample rate, FFT size), and applied to each block of STFT frames with one matrix multiply.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from core.audio_utils import DSP_BLOCK_SIZE, pcm_to_float
+
+
+@lru_cache(maxsize=32)
+def band_filterbank(sample_rate: int, n_fft: int, bands: tuple) -> np.ndarray:
+    """
+    Rectangular linear-frequency filterbank
+
+    Args:
+        sample_rate: Sample rate in Hz
+        n_fft: FFT size
+        bands: Tuple of (low_hz, high_hz) pairs
+
+    Returns:
+        Read-only float32 matrix of shape (len(bands), n_fft // 2 + 1)
+    """
+    freqs = np.fft.rfftfreq(n_fft, 1 / sample_rate)
+    matrix = np.stack([(freqs >= lo) & (freqs < hi) for lo, hi in bands]).astype(np.float32)
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=8)
+def _window(n_fft: int) -> np.ndarray:
+    window = np.hanning(n_fft).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+
+def stft_band_energies(audio_array: np.ndarray, sample_rate: int, bands: tuple,
+                       frame_duration: float = 0.032, hop_duration: float = 0.010) -> np.ndarray:
+    """
+    Per-frame energy in each band
+
+    Frames are windowed and transformed in blocks of frames (one rfft call per
+    block), then each block is projected onto the cached filterbank with one
+    matrix multiply.
+
+    Args:
+        audio_array: Audio waveform (int16 PCM or float)
+        sample_rate: Sample rate in Hz
+        bands: Tuple of (low_hz, high_hz) pairs
+        frame_duration: Frame / FFT length in seconds (512 samples @ 16kHz)
+        hop_duration: Hop length in seconds (160 samples @ 16kHz)
+
+    Returns:
+        Array of shape (n_frames, len(bands)); empty when audio is shorter than one frame
+    """
+    n_fft = max(1, int(round(frame_duration * sample_rate)))
+    hop = max(1, int(round(hop_duration * sample_rate)))
+    filterbank = band_filterbank(sample_rate, n_fft, bands)
+    window = _window(n_fft)
+    n_frames = 1 + (len(audio_array) - n_fft) // hop if len(audio_array) >= n_fft else 0
+    energies = np.empty((n_frames, len(bands)), dtype=np.float32)
+
+    frames_per_block = max(1, DSP_BLOCK_SIZE // hop)
+    for first in range(0, n_frames, frames_per_block):
+        count = min(frames_per_block, n_frames - first)
+        start = first * hop
+        block = pcm_to_float(audio_array[start:start + (count - 1) * hop + n_fft])
+        frames = np.lib.stride_tricks.sliding_window_view(block, n_fft)[::hop]
+        power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        energies[first:first + count] = power.astype(np.float32) @ filterbank.T
+
+    return energies
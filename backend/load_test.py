@@ -0,0 +1,384 @@
+"""
+Concurrent-clinician load test for the analysis API.
+Replays a weighted mix of realistic sessions (articulation screeners, Rainbow Passage
+recordings, short S/Z clips) against the ASGI app in-process or a running server, then
+reports latency percentiles, error rate, throughput and peak RSS against SLO thresholds.
+
+RSS is summed over --server-pid and all of its descendants, so a pre-forked server
+(SERVE_MODE=production) is measured through its supervisor PID. In-process runs
+report the RSS of this script, which includes the load generator's own payloads.
+
+The in-process app runs with its shared cache disabled unless --server-cache is
+given; against --url, start the server with SHARED_CACHE_MAX_MB=0 or send at least
+as many --variants as requests, otherwise repeats measure cache hits.
+
+Usage (from backend/):
+    python load_test.py --concurrency 8 --requests 40
+    python load_test.py --url http://localhost:8000 --server-pid 1234 --slo-p95 5000
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+try:
+    import psutil
+except ImportError:  # RSS is reported only when psutil is available
+    psutil = None
+
+
+BROWSER_SAMPLE_RATE = 44100
+
+
+def synthesize_speech(duration_sec: float, sample_rate: int = BROWSER_SAMPLE_RATE, seed: int = 0) -> List[float]:
+    """
+    Generate speech-like PCM: voiced bursts with harmonics and noise, separated by pauses
+
+    Args:
+        duration_sec: Length of the clip in seconds
+        sample_rate: Sample rate in Hz
+        seed: Random seed so payloads are reproducible
+
+    Returns:
+        Samples as a list of floats (rounded as the browser JSON would be)
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration_sec * sample_rate)
+    t = np.arange(n) / sample_rate
+    f0 = 120 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+
+    # ~250 ms syllables with occasional ~400 ms pauses
+    envelope = np.zeros(n)
+    pos = 0
+    while pos < n:
+        seg = int(rng.uniform(0.15, 0.35) * sample_rate)
+        envelope[pos:pos + seg] = np.hanning(min(seg, n - pos))
+        pos += seg + int(rng.choice([0.03, 0.05, 0.4], p=[0.5, 0.35, 0.15]) * sample_rate)
+
+    audio = 0.3 * envelope * voiced + 0.005 * rng.standard_normal(n)
+    return np.round(audio, 4).tolist()
+
+
+def fricative(duration_sec: float, sample_rate: int = BROWSER_SAMPLE_RATE, seed: int = 0) -> List[float]:
+    """Generate a sustained /s/-like noise clip"""
+    rng = np.random.default_rng(seed)
+    n = int(duration_sec * sample_rate)
+    audio = 0.1 * rng.standard_normal(n)
+    return np.round(audio, 4).tolist()
+
+
+def to_pcm16(samples: List[float]) -> str:
+    """Base64 int16 PCM as sent by the compact transport"""
+    pcm = np.clip(np.rint(np.asarray(samples) * 32767), -32768, 32767).astype("<i2")
+    return base64.b64encode(pcm.tobytes()).decode()
+
+
+def build_scenarios(articulation_words: int, rainbow_sec: float, sz_sec: float, pcm16: bool = False,
+                    variants: int = 1) -> Dict[str, Dict]:
+    """
+    Build request templates for each scenario, serialized once up front
+
+    Each scenario gets `variants` distinct recordings (different seeds), so the
+    server's shared result/audio cache only hits once the variants are reused.
+
+    Args:
+        pcm16: Send audio as base64 int16 (audio_pcm16) instead of float lists
+        variants: Number of distinct payloads per scenario
+
+    Returns:
+        Mapping of scenario name -> {"path": str, "bodies": [bytes, ...]}
+    """
+    def audio_fields(samples):
+        return {"audio_pcm16": to_pcm16(samples)} if pcm16 else {"audio_data": samples}
+
+    scenarios = {
+        "articulation": {"path": "/api/analyze/articulation-screener", "bodies": []},
+        "rainbow": {"path": "/api/analyze/rate-of-speech", "bodies": []},
+        "sz": {"path": "/api/sz/analyze", "bodies": []},
+    }
+
+    for v in range(variants):
+        seed = v * 10000
+        words = []
+        for i in range(articulation_words):
+            words.append({
+                "word_id": i + 1,
+                "english": f"word{i + 1}",
+                "tamil": "",
+                "ipa": "",
+                "cr": "",
+                "recorded_text": "",
+                "scores": {"S": i % 7 == 0, "O": i % 11 == 0, "D": False, "A": False},
+                "notes": "",
+                **audio_fields(synthesize_speech(1.2, seed=seed + i)),
+                "sampling_rate": BROWSER_SAMPLE_RATE,
+            })
+        articulation = {"words": words, "patient_age": 8, "patient_type": "child"}
+
+        rainbow = {
+            "type": "rainbow",
+            **audio_fields(synthesize_speech(rainbow_sec, seed=seed + 1000)),
+            "sample_rate": BROWSER_SAMPLE_RATE,
+            "word_count": 327,
+        }
+
+        sz = {
+            "type": "s",
+            **audio_fields(fricative(sz_sec, seed=seed + 2000)),
+            "sample_rate": BROWSER_SAMPLE_RATE,
+        }
+
+        scenarios["articulation"]["bodies"].append(json.dumps(articulation).encode())
+        scenarios["rainbow"]["bodies"].append(json.dumps(rainbow).encode())
+        scenarios["sz"]["bodies"].append(json.dumps(sz).encode())
+
+    return scenarios
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse 'articulation=1,rainbow=1,sz=3' into scenario weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentile of a list, 0.0 when empty"""
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+class RssSampler:
+    """
+    Periodically samples the resident set size of a process and its descendants
+
+    Pages shared between processes (e.g. memory-mapped cache entries) are counted
+    once per process, so the total is an upper bound on the tree's footprint.
+    """
+
+    def __init__(self, pid: Optional[int], interval: float = 0.25):
+        self.process = psutil.Process(pid) if psutil is not None else None
+        self.interval = interval
+        self.peak_bytes = 0
+        self._task = None
+
+    def sample(self):
+        if self.process is None:
+            return
+        try:
+            total = self.process.memory_info().rss
+            children = self.process.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+        for child in children:
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass  # worker exited or restarted between listing and sampling
+        self.peak_bytes = max(self.peak_bytes, total)
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.sample()
+
+
+async def run_load(client: httpx.AsyncClient, scenarios: Dict[str, Dict], weights: Dict[str, int],
+                   concurrency: int, total_requests: int, seed: int = 0) -> Dict[str, List]:
+    """
+    Issue total_requests requests drawn from the weighted mix with a fixed number of workers
+
+    Returns:
+        Mapping of scenario name -> list of (latency_sec, ok) tuples
+    """
+    rng = np.random.default_rng(seed)
+    names = list(weights)
+    probs = np.array([weights[n] for n in names], dtype=float)
+    plan = list(rng.choice(names, size=total_requests, p=probs / probs.sum()))
+    results = {name: [] for name in names}
+    sent = {name: 0 for name in names}
+    queue = asyncio.Queue()
+    for name in plan:
+        queue.put_nowait(name)
+
+    async def worker():
+        while True:
+            try:
+                name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            scenario = scenarios[name]
+            body = scenario["bodies"][sent[name] % len(scenario["bodies"])]
+            sent[name] += 1
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    scenario["path"],
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                )
+                ok = response.status_code == 200 and "error" not in response.json()
+            except Exception as e:
+                print(f"{name} request failed: {e}", file=sys.stderr)
+                ok = False
+            results[name].append((time.perf_counter() - start, ok))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+def summarize(results: Dict[str, List], elapsed_sec: float, peak_rss_bytes: int, rss_scope: str = None) -> Dict:
+    """Aggregate per-scenario and overall latency/error statistics"""
+    def stats(samples):
+        latencies = [lat * 1000 for lat, _ in samples]
+        errors = sum(1 for _, ok in samples if not ok)
+        return {
+            "requests": len(samples),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        }
+
+    all_samples = [s for samples in results.values() for s in samples]
+    overall = stats(all_samples)
+    overall["throughput_rps"] = round(len(all_samples) / elapsed_sec, 2) if elapsed_sec > 0 else 0.0
+    overall["elapsed_sec"] = round(elapsed_sec, 2)
+    overall["peak_rss_mb"] = round(peak_rss_bytes / 1e6, 1) if peak_rss_bytes else None
+    overall["rss_scope"] = rss_scope if peak_rss_bytes else None
+
+    return {
+        "overall": overall,
+        "scenarios": {name: stats(samples) for name, samples in results.items() if samples},
+    }
+
+
+def check_slo(summary: Dict, args) -> List[str]:
+    """Return a list of SLO violations (empty when all thresholds are met)"""
+    overall = summary["overall"]
+    violations = []
+    for key, limit in (("p50_ms", args.slo_p50), ("p95_ms", args.slo_p95), ("p99_ms", args.slo_p99)):
+        if limit is not None and overall[key] > limit:
+            violations.append(f"{key} {overall[key]} > {limit}")
+    if overall["error_rate"] > args.max_error_rate:
+        violations.append(f"error_rate {overall['error_rate']} > {args.max_error_rate}")
+    if args.min_throughput is not None and overall["throughput_rps"] < args.min_throughput:
+        violations.append(f"throughput_rps {overall['throughput_rps']} < {args.min_throughput}")
+    if args.max_rss_mb is not None and overall["peak_rss_mb"] is not None and overall["peak_rss_mb"] > args.max_rss_mb:
+        violations.append(f"peak_rss_mb {overall['peak_rss_mb']} > {args.max_rss_mb}")
+    return violations
+
+
+def print_report(summary: Dict, violations: List[str]):
+    overall = summary["overall"]
+    print(f"{'scenario':<14}{'requests':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for name, s in list(summary["scenarios"].items()) + [("overall", overall)]:
+        print(f"{name:<14}{s['requests']:>9}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['error_rate']:>9.2%}")
+    print(f"throughput: {overall['throughput_rps']} req/s over {overall['elapsed_sec']} s")
+    if overall["peak_rss_mb"] is not None:
+        print(f"peak RSS ({overall['rss_scope']}): {overall['peak_rss_mb']} MB")
+    else:
+        print("peak RSS: n/a")
+    if violations:
+        print("SLO FAILED: " + "; ".join(violations))
+    else:
+        print("SLO passed")
+
+
+async def main(args) -> int:
+    scenarios = build_scenarios(args.articulation_words, args.rainbow_sec, args.sz_sec, args.pcm16, args.variants)
+    weights = parse_mix(args.mix)
+    unknown = set(weights) - set(scenarios)
+    if unknown:
+        raise ValueError(f"Unknown scenarios in mix: {', '.join(sorted(unknown))}")
+
+    if args.url:
+        transport = None
+        base_url = args.url
+        pid = args.server_pid
+        rss_scope = "server process tree"
+        if args.variants < args.requests:
+            print(f"note: {args.variants} payload variants per scenario; repeats may be served from the "
+                  "server's shared cache (run it with SHARED_CACHE_MAX_MB=0 to measure uncached latency)")
+    else:
+        from app import app
+        if not args.server_cache:
+            # Measure full analysis cost, not shared-cache hits
+            from core.shared_cache import shared_cache
+            shared_cache.max_bytes = 0
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        base_url = "http://loadtest"
+        pid = os.getpid()
+        rss_scope = "load generator + in-process app"
+
+    sampler = RssSampler(pid) if pid is not None else None
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+        if sampler:
+            sampler.start()
+        start = time.perf_counter()
+        results = await run_load(client, scenarios, weights, args.concurrency, args.requests, args.seed)
+        elapsed = time.perf_counter() - start
+        if sampler:
+            await sampler.stop()
+
+    summary = summarize(results, elapsed, sampler.peak_bytes if sampler else 0, rss_scope)
+    violations = check_slo(summary, args)
+    print_report(summary, violations)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({**summary, "slo_violations": violations}, f, indent=2)
+    return 1 if violations else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-clinician load test for the analysis API")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process ASGI app)")
+    parser.add_argument("--server-pid", type=int, help="PID of the server (or its supervisor) for RSS sampling when using --url; "
+                        "child worker processes are included")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=40, help="Total number of requests to send")
+    parser.add_argument("--mix", default="articulation=1,rainbow=1,sz=3", help="Weighted scenario mix")
+    parser.add_argument("--articulation-words", type=int, default=30)
+    parser.add_argument("--rainbow-sec", type=float, default=60.0)
+    parser.add_argument("--sz-sec", type=float, default=3.0)
+    parser.add_argument("--variants", type=int, default=4, help="Distinct payloads per scenario")
+    parser.add_argument("--server-cache", action="store_true",
+                        help="Keep the shared result/audio cache enabled for the in-process app")
+    parser.add_argument("--pcm16", action="store_true", help="Send audio as base64 int16 PCM")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slo-p50", type=float, help="Max overall p50 latency in ms")
+    parser.add_argument("--slo-p95", type=float, help="Max overall p95 latency in ms")
+    parser.add_argument("--slo-p99", type=float, help="Max overall p99 latency in ms")
+    parser.add_argument("--max-error-rate", type=float, default=0.0)
+    parser.add_argument("--min-throughput", type=float, help="Min requests per second")
+    parser.add_argument("--max-rss-mb", type=float, help="Max peak RSS in MB (see the report for what was measured)")
+    parser.add_argument("--json", help="Write the summary to this JSON file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
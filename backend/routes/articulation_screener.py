@@ -3,17 +3,29 @@ Articulation Screener Backend Endpoint
 Analyzes articulation test recordings from Tamil words (TAT - Test of Articulation in Tamil)
 """
 
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional, Dict
+import re
+import uuid
 import numpy as np
 
+from core.audio_utils import ANALYSIS_SAMPLE_RATE, cached_analysis_audio, decode_pcm, pcm_to_float
+from core.shared_cache import audio_key, session_store, shared_cache
+
 router = APIRouter()
 
+# Spectral bandwidth (Hz, at the upload sample rate) above which a recording is marked
+# DEGRADED. Decimation to ANALYSIS_SAMPLE_RATE narrows the measured bandwidth of broadband
+# speech, so the threshold is scaled by the decimation factor: unchanged for audio that is
+# not resampled, ~726 Hz for 44.1 kHz uploads analysed at 16 kHz.
+DEGRADED_BANDWIDTH_HZ = 2000
+
 
 class AudioData(BaseModel):
     """Audio data transferred as JSON from frontend"""
-    audio_data: List[float]
+    audio_data: List[float] = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
     sample_rate: int
 
 
@@ -27,9 +39,14 @@ class WordScore(BaseModel):
     recorded_text: str
     scores: Dict[str, bool]  # S, O, D, A keys
     notes: str
-    audio_data: List[float]
+    audio_data: List[float] = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
     sampling_rate: int
 
+    @property
+    def has_audio(self) -> bool:
+        return len(self.audio_data) > 0 or bool(self.audio_pcm16)
+
 
 class ArticulationScreenerRequest(BaseModel):
     """Request model for articulation screening"""
@@ -49,18 +66,50 @@ class ArticulationScreenerResponse(BaseModel):
     detailed_analysis: List[Dict]
 
 
+class ScreenerSessionStart(BaseModel):
+    """Request model for starting an incremental screener session"""
+    patient_age: Optional[int] = None
+    patient_type: Optional[str] = None  # child, adult, elderly
+
+
+class ScreenerSessionInfo(BaseModel):
+    """Identifier of a started screener session"""
+    session_id: str
+    patient_age: Optional[int] = None
+    patient_type: Optional[str] = None
+
+
+class ScreenerSessionProgress(BaseModel):
+    """Running aggregates of a screener session"""
+    session_id: str
+    total_words: int
+    words_recorded: int
+    words_with_errors: int
+    error_summary: Dict[str, int]
+    accuracy_percentage: float
+    severity_level: str
+
+
+class ScreenerWordResult(BaseModel):
+    """Analysis of one posted word plus the updated session aggregates"""
+    word_analysis: Dict
+    progress: ScreenerSessionProgress
+
+
 def analyze_audio_for_distortion(audio_array: np.ndarray, sample_rate: int) -> Dict:
     """
     Analyze audio for voice quality issues (distortion, nasality, etc.)
     Uses spectral analysis to detect potential articulation issues
     
     Args:
-        audio_array: Audio waveform
+        audio_array: Audio waveform (int16 PCM or float)
         sample_rate: Sample rate in Hz
     
     Returns:
         Dictionary with analysis results
     """
+    audio_array = pcm_to_float(audio_array)
+    
     # Calculate RMS energy
     rms_energy = np.sqrt(np.mean(audio_array ** 2))
     
@@ -144,6 +193,62 @@ def classify_severity(error_count: int, total_words: int) -> str:
         return "SEVERE"
 
 
+def analyze_word(word: WordScore) -> Dict:
+    """
+    Score one word and run spectral analysis on its recording
+    
+    Args:
+        word: Individual word scoring data with optional audio
+    
+    Returns:
+        Per-word analysis entry as used in detailed_analysis
+    """
+    word_analysis = {
+        "word_id": word.word_id,
+        "english": word.english,
+        "tamil": word.tamil,
+        "ipa": word.ipa,
+        "recorded_text": word.recorded_text,
+        "notes": word.notes,
+        "errors": calculate_articulation_errors(word)["errors"],
+    }
+    
+    # Analyze audio quality if recording exists
+    if word.has_audio and word.sampling_rate > 0:
+        try:
+            audio_array = decode_pcm(word.audio_data, word.audio_pcm16)
+            key = audio_key(audio_array, word.sampling_rate)
+            audio_analysis = shared_cache.get_json(f"articulation{ANALYSIS_SAMPLE_RATE}", key)
+            if audio_analysis is None:
+                audio_array, analysis_sr = cached_analysis_audio(audio_array, word.sampling_rate, key)
+                audio_analysis = analyze_audio_for_distortion(audio_array, analysis_sr)
+                shared_cache.put_json(f"articulation{ANALYSIS_SAMPLE_RATE}", key, audio_analysis)
+            word_analysis["audio_analysis"] = audio_analysis
+            
+            # If distortion is high, might indicate D (Distortion)
+            analysis_sr = min(word.sampling_rate, ANALYSIS_SAMPLE_RATE)
+            threshold = DEGRADED_BANDWIDTH_HZ * analysis_sr / word.sampling_rate
+            if audio_analysis["spectral_bandwidth"] > threshold:
+                word_analysis["audio_quality"] = "DEGRADED"
+            else:
+                word_analysis["audio_quality"] = "CLEAR"
+        except Exception as e:
+            word_analysis["audio_analysis"] = {"error": str(e)}
+            word_analysis["audio_quality"] = "UNKNOWN"
+    
+    return word_analysis
+
+
+def calculate_accuracy(words_with_errors: int, total_words: int) -> float:
+    """Percentage of words without errors, rounded to one decimal"""
+    accuracy_percentage = (
+        ((total_words - words_with_errors) / total_words * 100)
+        if total_words > 0
+        else 0
+    )
+    return round(accuracy_percentage, 1)
+
+
 @router.post("/articulation-screener", response_model=ArticulationScreenerResponse)
 async def analyze_articulation_screener(
     request: ArticulationScreenerRequest = Body(...)
@@ -165,7 +270,7 @@ async def analyze_articulation_screener(
     """
     try:
         total_words = len(request.words)
-        words_recorded = sum(1 for w in request.words if len(w.audio_data) > 0)
+        words_recorded = sum(1 for w in request.words if w.has_audio)
         
         # Initialize error tracking
         error_summary = {"S": 0, "O": 0, "D": 0, "A": 0}
@@ -174,53 +279,18 @@ async def analyze_articulation_screener(
         
         # Analyze each word
         for word in request.words:
-            word_analysis = {
-                "word_id": word.word_id,
-                "english": word.english,
-                "tamil": word.tamil,
-                "ipa": word.ipa,
-                "recorded_text": word.recorded_text,
-                "notes": word.notes,
-                "errors": {},
-            }
-            
-            # Calculate articulation errors
-            error_result = calculate_articulation_errors(word)
-            word_analysis["errors"] = error_result["errors"]
+            word_analysis = analyze_word(word)
             
             # Update error summary
-            for error_type, has_error in error_result["errors"].items():
+            for error_type, has_error in word_analysis["errors"].items():
                 if has_error:
                     error_summary[error_type] += 1
             
-            if error_result["has_errors"]:
+            if any(word_analysis["errors"].values()):
                 words_with_errors += 1
             
-            # Analyze audio quality if recording exists
-            if len(word.audio_data) > 0 and word.sampling_rate > 0:
-                try:
-                    audio_array = np.array(word.audio_data, dtype=np.float32)
-                    audio_analysis = analyze_audio_for_distortion(audio_array, word.sampling_rate)
-                    word_analysis["audio_analysis"] = audio_analysis
-                    
-                    # If distortion is high, might indicate D (Distortion)
-                    if audio_analysis["spectral_bandwidth"] > 2000:  # Threshold
-                        word_analysis["audio_quality"] = "DEGRADED"
-                    else:
-                        word_analysis["audio_quality"] = "CLEAR"
-                except Exception as e:
-                    word_analysis["audio_analysis"] = {"error": str(e)}
-                    word_analysis["audio_quality"] = "UNKNOWN"
-            
             detailed_analysis.append(word_analysis)
         
-        # Calculate overall metrics
-        accuracy_percentage = (
-            ((total_words - words_with_errors) / total_words * 100)
-            if total_words > 0
-            else 0
-        )
-        
         severity_level = classify_severity(words_with_errors, total_words)
         
         return ArticulationScreenerResponse(
@@ -228,10 +298,147 @@ async def analyze_articulation_screener(
             words_recorded=words_recorded,
             words_with_errors=words_with_errors,
             error_summary=error_summary,
-            accuracy_percentage=round(accuracy_percentage, 1),
+            accuracy_percentage=calculate_accuracy(words_with_errors, total_words),
             severity_level=severity_level,
             detailed_analysis=detailed_analysis,
         )
     
     except Exception as e:
         raise ValueError(f"Error analyzing articulation screener: {str(e)}")
+
+
+# Incremental sessions: words are posted one at a time as they are recorded and
+# scored immediately; the session keeps running aggregates (no audio) server-side.
+
+SESSION_NAMESPACE = "articulation-session"
+SESSION_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def load_session(session_id: str) -> Dict:
+    """Session state for session_id, raising 404 when unknown or expired"""
+    state = session_store.get_json(SESSION_NAMESPACE, session_id) if SESSION_ID_PATTERN.fullmatch(session_id) else None
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Unknown screener session: {session_id}")
+    return state
+
+
+def save_session(session_id: str, state: Dict):
+    """Persist session state, answering 503 if it cannot be written"""
+    try:
+        session_store.put_json(SESSION_NAMESPACE, session_id, state)
+    except OSError as e:
+        raise HTTPException(status_code=503, detail=f"Could not save screener session: {e}")
+
+
+def session_progress(session_id: str, state: Dict) -> ScreenerSessionProgress:
+    return ScreenerSessionProgress(
+        session_id=session_id,
+        total_words=state["total_words"],
+        words_recorded=state["words_recorded"],
+        words_with_errors=state["words_with_errors"],
+        error_summary=state["error_summary"],
+        accuracy_percentage=calculate_accuracy(state["words_with_errors"], state["total_words"]),
+        severity_level=classify_severity(state["words_with_errors"], state["total_words"]),
+    )
+
+
+def apply_word(state: Dict, entry: Dict, sign: int):
+    """Add (sign=1) or remove (sign=-1) one stored word entry's contribution to the aggregates"""
+    word_analysis = entry["analysis"]
+    state["total_words"] += sign
+    if entry["has_audio"]:
+        state["words_recorded"] += sign
+    if any(word_analysis["errors"].values()):
+        state["words_with_errors"] += sign
+    for error_type, has_error in word_analysis["errors"].items():
+        if has_error:
+            state["error_summary"][error_type] += sign
+
+
+@router.post("/articulation-screener/sessions", response_model=ScreenerSessionInfo)
+async def start_screener_session(request: ScreenerSessionStart = Body(...)) -> ScreenerSessionInfo:
+    """
+    Start an incremental articulation screener session
+    
+    Returns:
+        ScreenerSessionInfo with the session_id to post words to
+    """
+    if not session_store.enabled:
+        raise HTTPException(status_code=503, detail="Screener session store is disabled")
+    
+    session_id = uuid.uuid4().hex
+    save_session(session_id, {
+        "patient_age": request.patient_age,
+        "patient_type": request.patient_type,
+        "total_words": 0,
+        "words_recorded": 0,
+        "words_with_errors": 0,
+        "error_summary": {"S": 0, "O": 0, "D": 0, "A": 0},
+        "words": {},
+    })
+    return ScreenerSessionInfo(session_id=session_id, patient_age=request.patient_age, patient_type=request.patient_type)
+
+
+@router.post("/articulation-screener/sessions/{session_id}/words", response_model=ScreenerWordResult)
+async def add_screener_word(session_id: str, word: WordScore = Body(...)) -> ScreenerWordResult:
+    """
+    Score one recorded word within a session
+    
+    Re-posting a word_id replaces the earlier attempt in the aggregates.
+    
+    Args:
+        session_id: Session from start_screener_session
+        word: Scoring and audio for a single word
+    
+    Returns:
+        ScreenerWordResult with this word's analysis and the updated aggregates
+    """
+    load_session(session_id)
+    
+    # Spectral analysis runs outside the session lock
+    word_analysis = analyze_word(word)
+    
+    with session_store.lock(SESSION_NAMESPACE, session_id):
+        state = load_session(session_id)
+        previous = state["words"].get(str(word.word_id))
+        if previous is not None:
+            apply_word(state, previous, -1)
+        # Same words_recorded predicate as the one-shot endpoint
+        entry = {"has_audio": word.has_audio, "analysis": word_analysis}
+        apply_word(state, entry, 1)
+        state["words"][str(word.word_id)] = entry
+        save_session(session_id, state)
+    
+    return ScreenerWordResult(word_analysis=word_analysis, progress=session_progress(session_id, state))
+
+
+@router.get("/articulation-screener/sessions/{session_id}", response_model=ScreenerSessionProgress)
+async def get_screener_session(session_id: str) -> ScreenerSessionProgress:
+    """Current running aggregates of a session"""
+    return session_progress(session_id, load_session(session_id))
+
+
+@router.post("/articulation-screener/sessions/{session_id}/finalize", response_model=ArticulationScreenerResponse)
+async def finalize_screener_session(session_id: str) -> ArticulationScreenerResponse:
+    """
+    Finish a session and return the same report as the one-shot endpoint
+    
+    Aggregates are already up to date, so nothing is recomputed. The session
+    is removed afterwards.
+    """
+    load_session(session_id)
+    
+    with session_store.lock(SESSION_NAMESPACE, session_id):
+        state = load_session(session_id)
+        session_store.delete(SESSION_NAMESPACE, session_id)
+    
+    progress = session_progress(session_id, state)
+    return ArticulationScreenerResponse(
+        total_words=progress.total_words,
+        words_recorded=progress.words_recorded,
+        words_with_errors=progress.words_with_errors,
+        error_summary=progress.error_summary,
+        accuracy_percentage=progress.accuracy_percentage,
+        severity_level=progress.severity_level,
+        detailed_analysis=[entry["analysis"] for entry in state["words"].values()],
+    )
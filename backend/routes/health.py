@@ -0,0 +1,57 @@
+"""
+Health and readiness probes
+/health reports the process is up; /ready turns green only after warm-up has
+exercised the DSP path (scipy filters, FFTs, filterbanks) and the shared cache directory.
+"""
+
+import os
+
+import numpy as np
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from core.audio_utils import ANALYSIS_SAMPLE_RATE, float_to_pcm, to_analysis_rate
+from core.shared_cache import shared_cache
+from routes.articulation_screener import analyze_audio_for_distortion
+from routes.rate_of_speech import detect_pauses
+from routes.resonance import analyze_resonance_bands
+
+router = APIRouter()
+
+state = {"ready": False, "error": None}
+
+
+def warm_up():
+    """Run a short synthetic signal through the analysis pipeline, then mark ready"""
+    try:
+        for sr in (44100, 48000):
+            t = np.arange(sr) / sr
+            audio = float_to_pcm(0.1 * np.sin(2 * np.pi * 220 * t))
+            analysis_audio, analysis_sr = to_analysis_rate(audio, sr)
+            detect_pauses(analysis_audio, analysis_sr)
+            analyze_audio_for_distortion(analysis_audio, analysis_sr)
+            analyze_resonance_bands(analysis_audio, analysis_sr)
+
+        shared_cache.put_json("warmup", str(os.getpid()), {"ok": True})
+        state["ready"] = True
+    except Exception as e:
+        print(f"warm-up error: {e}")
+        state["error"] = str(e)
+
+
+@router.get("/health")
+async def health():
+    return {"status": "ok", "pid": os.getpid()}
+
+
+@router.get("/ready")
+async def ready():
+    body = {
+        "ready": state["ready"],
+        "pid": os.getpid(),
+        "analysis_sample_rate": ANALYSIS_SAMPLE_RATE,
+        "shared_cache": shared_cache.enabled,
+    }
+    if state["error"]:
+        body["error"] = state["error"]
+    return JSONResponse(body, status_code=200 if state["ready"] else 503)
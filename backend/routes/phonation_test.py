@@ -1,13 +1,15 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-import numpy as np
+from typing import Optional
+from core.audio_utils import decode_pcm, pcm_to_float
 
 router = APIRouter()
 
 
 class AudioData(BaseModel):
     vowel: str
-    audio_data: list
+    audio_data: list = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
     sample_rate: int
 
 
@@ -15,11 +17,11 @@ class AudioData(BaseModel):
 async def analyze_phonation(data: AudioData):
     """
     Analyze phonation vowel from decoded PCM data
-    Expects: {vowel: 'a'|'ii'|'u'|'uhm', audio_data: float[], sample_rate: int}
+    Expects: {vowel: 'a'|'ii'|'u'|'uhm', audio_data: float[] | audio_pcm16: base64 int16, sample_rate: int}
     """
     try:
-        # Convert audio data to numpy array
-        audio_array = np.array(data.audio_data, dtype=np.float32)
+        # Decode audio into a compact int16 buffer
+        audio_array = decode_pcm(data.audio_data, data.audio_pcm16)
         sr = data.sample_rate
         vowel = data.vowel
 
@@ -30,7 +32,7 @@ async def analyze_phonation(data: AudioData):
         # Downsample for waveform display
         max_points = 3000
         factor = max(1, len(audio_array) // max_points)
-        waveform = audio_array[::factor].tolist()
+        waveform = pcm_to_float(audio_array[::factor]).tolist()
 
         return {
             "vowel": vowel,
@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Query
 from pydantic import BaseModel
-import numpy as np
+from typing import Optional
+from core.audio_utils import decode_pcm, pcm_to_float
 
 router = APIRouter()
 
 
 class AudioData(BaseModel):
-    audio_data: list
+    audio_data: list = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
     sample_rate: int
 
 
 class AmrData(BaseModel):
     sound: str
-    audio_data: list
+    audio_data: list = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
     sample_rate: int
 
 
@@ -21,7 +24,7 @@ async def analyze_amr(sound: str = Query(...), data: AudioData = None):
     """
     Analyze Alternating Motion Rate (AMR) test sound
     sound = 'pa' | 'ta' | 'ka'
-    Accepts: {audio_data: float[], sample_rate: int}
+    Accepts: {audio_data: float[] | audio_pcm16: base64 int16, sample_rate: int}
     """
     # Handle both query param and JSON body
     if data is None:
@@ -29,8 +32,8 @@ async def analyze_amr(sound: str = Query(...), data: AudioData = None):
         data = Body(...)
     
     try:
-        # Convert audio data to numpy array
-        audio_array = np.array(data.audio_data, dtype=np.float32)
+        # Decode audio into a compact int16 buffer
+        audio_array = decode_pcm(data.audio_data, data.audio_pcm16)
         sr = data.sample_rate
 
         # Calculate duration
@@ -40,7 +43,7 @@ async def analyze_amr(sound: str = Query(...), data: AudioData = None):
         # Downsample for waveform display
         max_points = 3000
         factor = max(1, len(audio_array) // max_points)
-        waveform = audio_array[::factor].tolist()
+        waveform = pcm_to_float(audio_array[::factor]).tolist()
 
         return {
             "sound": sound,
@@ -66,11 +69,11 @@ async def analyze_amr(sound: str = Query(...), data: AudioData = None):
 async def analyze_smr(data: AudioData):
     """
     Analyze Sequential Motion Rate (SMR) test - PATAKA sequence
-    Expects: {audio_data: float[], sample_rate: int}
+    Expects: {audio_data: float[] | audio_pcm16: base64 int16, sample_rate: int}
     """
     try:
-        # Convert audio data to numpy array
-        audio_array = np.array(data.audio_data, dtype=np.float32)
+        # Decode audio into a compact int16 buffer
+        audio_array = decode_pcm(data.audio_data, data.audio_pcm16)
         sr = data.sample_rate
 
         # Calculate duration
@@ -80,7 +83,7 @@ async def analyze_smr(data: AudioData):
         # Downsample for waveform display
         max_points = 3000
         factor = max(1, len(audio_array) // max_points)
-        waveform = audio_array[::factor].tolist()
+        waveform = pcm_to_float(audio_array[::factor]).tolist()
 
         return {
             "test_type": "smr",
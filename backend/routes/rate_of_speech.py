@@ -9,19 +9,26 @@ from pydantic import BaseModel
 from typing import List, Optional
 import numpy as np
 
+from core.audio_utils import (
+    ANALYSIS_SAMPLE_RATE, DSP_BLOCK_SIZE, cached_analysis_audio, decode_pcm, iter_float_blocks, pcm_to_float,
+)
+from core.shared_cache import audio_key, shared_cache
+
 router = APIRouter()
 
 
 class AudioData(BaseModel):
     """Audio data transferred as JSON from frontend"""
-    audio_data: List[float]
+    audio_data: List[float] = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
     sample_rate: int
 
 
 class RateOfSpeechRequest(BaseModel):
     """Request model for rate of speech analysis"""
     type: str  # "rainbow" or "conversational"
-    audio_data: List[float]
+    audio_data: List[float] = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
     sample_rate: int
     word_count: Optional[int] = None  # Exact word count for rainbow passage, None for conversational
 
@@ -113,7 +120,7 @@ def classify_speaking_rate(wpm: float) -> str:
         return "FAST"
 
 
-def detect_pauses(audio_array: np.ndarray, sample_rate: int, threshold: float = 0.02) -> tuple[int, float]:
+def detect_pauses(audio_array: np.ndarray, sample_rate: int, threshold: float = 0.02, frame_duration: float = 0.023) -> tuple[int, float]:
     """
     Detect pauses in speech (silence periods)
     
@@ -121,20 +128,27 @@ def detect_pauses(audio_array: np.ndarray, sample_rate: int, threshold: float =
         audio_array: Audio waveform as numpy array
         sample_rate: Sample rate in Hz
         threshold: Silence threshold (amplitude below this is considered silence)
+        frame_duration: Energy frame length in seconds (independent of sample rate)
     
     Returns:
         Tuple of (pause_count, total_pause_duration_sec)
     """
-    # Calculate RMS energy per frame (1024 samples ~23ms @ 44.1kHz)
-    frame_size = 1024
+    if len(audio_array) == 0:
+        return 0, 0.0
     
-    # Pad audio to make it divisible by frame_size
-    padded_length = ((len(audio_array) + frame_size - 1) // frame_size) * frame_size
-    padded_audio = np.pad(audio_array, (0, padded_length - len(audio_array)), mode='constant')
+    # Calculate RMS energy per frame (~23ms, e.g. 368 samples @ 16kHz)
+    frame_size = max(1, int(round(frame_duration * sample_rate)))
     
-    # Calculate energy per frame
-    frames = padded_audio.reshape(-1, frame_size)
-    energies = np.sqrt(np.mean(frames ** 2, axis=1))
+    # Calculate energy per frame, converting PCM to float in blocks of whole frames
+    # (the last partial frame is zero-padded)
+    block_size = frame_size * max(1, DSP_BLOCK_SIZE // frame_size)
+    energies = []
+    for block in iter_float_blocks(audio_array, block_size):
+        padded_length = ((len(block) + frame_size - 1) // frame_size) * frame_size
+        block = np.pad(block, (0, padded_length - len(block)), mode='constant')
+        frames = block.reshape(-1, frame_size)
+        energies.append(np.sqrt(np.mean(frames ** 2, axis=1)))
+    energies = np.concatenate(energies)
     
     # Normalize energy
     max_energy = np.max(energies) if np.max(energies) > 0 else 1.0
@@ -165,10 +179,10 @@ def downsample_waveform(audio_array: np.ndarray, target_points: int = 3000) -> L
         Downsampled waveform as list of floats
     """
     if len(audio_array) <= target_points:
-        return audio_array.tolist()
+        return pcm_to_float(audio_array).tolist()
     
     factor = max(1, len(audio_array) // target_points)
-    return audio_array[::factor].tolist()
+    return pcm_to_float(audio_array[::factor]).tolist()
 
 
 @router.post("/rate-of-speech", response_model=RateOfSpeechResponse)
@@ -184,6 +198,7 @@ async def analyze_rate_of_speech(request: RateOfSpeechRequest = Body(...)) -> Ra
         request: RateOfSpeechRequest containing:
             - type: "rainbow" or "conversational"
             - audio_data: PCM audio samples as list of floats
+            - audio_pcm16: Base64 int16 PCM (compact alternative to audio_data)
             - sample_rate: Sample rate in Hz (typically 44100)
             - word_count: Exact word count (for rainbow) or None (for conversational)
     
@@ -198,12 +213,23 @@ async def analyze_rate_of_speech(request: RateOfSpeechRequest = Body(...)) -> Ra
         - pause_duration_sec: Total pause duration
     """
     try:
-        # Convert audio data to numpy array
-        audio_array = np.array(request.audio_data, dtype=np.float32)
+        # Decode audio into a compact int16 buffer
+        audio_array = decode_pcm(request.audio_data, request.audio_pcm16)
+        
+        # Identical recordings (retries, other workers) reuse the shared result
+        key = audio_key(audio_array, request.sample_rate)
+        result_namespace = f"rate-of-speech{ANALYSIS_SAMPLE_RATE}"
+        result_key = f"{key}-{request.type}-{request.word_count}"
+        cached = shared_cache.get_json(result_namespace, result_key)
+        if cached is not None:
+            return RateOfSpeechResponse(**cached)
         
         # Calculate duration
         duration_sec = len(audio_array) / request.sample_rate
         
+        # Decimate to the fixed analysis rate for pause detection
+        analysis_audio, analysis_sr = cached_analysis_audio(audio_array, request.sample_rate, key)
+        
         # Calculate WPM based on assessment type
         if request.type in ["rainbow", "rainbow_passage"]:
             # Rainbow Passage: Use exact word count (327)
@@ -215,7 +241,7 @@ async def analyze_rate_of_speech(request: RateOfSpeechRequest = Body(...)) -> Ra
         
         elif request.type == "conversational":
             # Conversational: Estimate based on actual speech activity (excluding pauses)
-            wpm, estimated_words = estimate_wpm_from_duration(duration_sec, audio_array, request.sample_rate)
+            wpm, estimated_words = estimate_wpm_from_duration(duration_sec, analysis_audio, analysis_sr)
         
         else:
             raise ValueError(f"Invalid assessment type: {request.type}")
@@ -224,12 +250,12 @@ async def analyze_rate_of_speech(request: RateOfSpeechRequest = Body(...)) -> Ra
         speaking_rate = classify_speaking_rate(wpm)
         
         # Detect pauses
-        pause_count, pause_duration_sec = detect_pauses(audio_array, request.sample_rate)
+        pause_count, pause_duration_sec = detect_pauses(analysis_audio, analysis_sr)
         
-        # Downsample for visualization
+        # Downsample original signal for visualization
         waveform = downsample_waveform(audio_array, target_points=3000)
         
-        return RateOfSpeechResponse(
+        response = RateOfSpeechResponse(
             type=request.type,
             duration_sec=round(duration_sec, 2),
             words_per_minute=round(wpm, 1),
@@ -240,6 +266,8 @@ async def analyze_rate_of_speech(request: RateOfSpeechRequest = Body(...)) -> Ra
             pause_count=pause_count,
             pause_duration_sec=round(pause_duration_sec, 2)
         )
+        shared_cache.put_json(result_namespace, result_key, response.model_dump())
+        return response
     
     except Exception as e:
         raise ValueError(f"Error analyzing rate of speech: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Resonance Analysis Endpoint
+Measures band energy ratios from a single microphone recording for the
+resonance and articulation assessment, alongside the AMR/SMR analyses.
+
+These are raw, uncalibrated acoustic ratios, not a nasality measure: with one
+microphone the nasal band also tracks F1 (vowel height), so oral /i/ and /u/
+score high and oral /a/ scores low. No resonance classification is made.
+"""
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+from typing import Optional
+import numpy as np
+
+from core.audio_utils import ANALYSIS_SAMPLE_RATE, cached_analysis_audio, decode_pcm
+from core.shared_cache import audio_key, shared_cache
+from core.spectral_utils import stft_band_energies
+
+router = APIRouter()
+
+# Nasal murmur band vs oral band (Hz), used for a nasometer-style ratio:
+# nasal_band_percent = nasal / (nasal + oral) * 100 (uncalibrated)
+NASAL_BAND = (200, 500)
+ORAL_BAND = (500, 4000)
+
+# Formant regions (Hz)
+FORMANT_REGIONS = {
+    "F1": (300, 900),
+    "F2": (900, 2500),
+    "F3": (2500, 3500),
+}
+
+BANDS = (NASAL_BAND, ORAL_BAND) + tuple(FORMANT_REGIONS.values())
+
+# Frames quieter than this (dB below the loudest frame) are treated as silence
+VOICED_FLOOR_DB = 30
+
+
+class AudioData(BaseModel):
+    audio_data: list = []
+    audio_pcm16: Optional[str] = None  # base64 little-endian int16, preferred over audio_data
+    sample_rate: int
+    stimulus: Optional[str] = None  # e.g. "oral_sentence", "nasal_sentence", "vowel"
+
+
+def analyze_resonance_bands(audio_array: np.ndarray, sample_rate: int) -> dict:
+    """
+    Compute nasometer-style band ratios and formant-region energies (uncalibrated)
+
+    Args:
+        audio_array: Audio waveform at the analysis rate
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Dictionary with the nasal band share, per-region energies (dB relative to the
+        summed band energy) and the number of voiced frames used
+    """
+    energies = stft_band_energies(audio_array, sample_rate, BANDS)
+    if len(energies) == 0:
+        raise ValueError("Recording is too short for resonance analysis")
+
+    # Keep voiced frames only
+    total = energies[:, :2].sum(axis=1)
+    floor = total.max() * 10 ** (-VOICED_FLOOR_DB / 10)
+    voiced = energies[total > floor] if total.max() > 0 else energies[:0]
+    if len(voiced) == 0:
+        raise ValueError("No voiced frames found")
+
+    nasal, oral = voiced[:, 0].sum(), voiced[:, 1].sum()
+    nasal_band_percent = float(nasal / (nasal + oral) * 100)
+
+    region_energy = voiced[:, 2:].sum(axis=0)
+    reference = region_energy.sum()
+    formant_energy_db = {
+        name: round(float(10 * np.log10(energy / reference + 1e-12)), 2) + 0.0
+        for name, energy in zip(FORMANT_REGIONS, region_energy)
+    }
+
+    return {
+        "nasal_band_percent": round(nasal_band_percent, 1),
+        "nasal_oral_ratio_db": round(float(10 * np.log10((nasal + 1e-12) / (oral + 1e-12))), 2),
+        "formant_energy_db": formant_energy_db,
+        "voiced_frames": int(len(voiced)),
+        "calibrated": False,
+    }
+
+
+@router.post("/resonance")
+async def analyze_resonance(data: AudioData):
+    """
+    Band energy ratios for the resonance assessment from decoded PCM data
+    Values are uncalibrated and must not be read as a resonance diagnosis.
+    Expects: {audio_data: float[] | audio_pcm16: base64 int16, sample_rate: int, stimulus?: str}
+    """
+    try:
+        # Decode audio into a compact int16 buffer
+        audio_array = decode_pcm(data.audio_data, data.audio_pcm16)
+        sr = data.sample_rate
+
+        # Calculate duration
+        duration = len(audio_array) / sr
+        duration = round(duration, 2)
+
+        key = audio_key(audio_array, sr)
+        result_namespace = f"resonance-v3-{ANALYSIS_SAMPLE_RATE}"
+        analysis = shared_cache.get_json(result_namespace, key)
+        if analysis is None:
+            analysis_audio, analysis_sr = cached_analysis_audio(audio_array, sr, key)
+            analysis = analyze_resonance_bands(analysis_audio, analysis_sr)
+            shared_cache.put_json(result_namespace, key, analysis)
+
+        return {
+            "test_type": "resonance",
+            "stimulus": data.stimulus,
+            "duration_sec": duration,
+            "sampling_rate": sr,
+            **analysis,
+        }
+    except Exception as e:
+        print(f"analyze_resonance error: {e}")
+        return {
+            "test_type": "resonance",
+            "stimulus": data.stimulus,
+            "duration_sec": 0,
+            "sampling_rate": 16000,
+            "error": str(e)
+        }
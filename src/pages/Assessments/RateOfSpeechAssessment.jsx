@@ -2,6 +2,7 @@ import React, { useState, useRef, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import AnnotatedWaveformCanvas from "../../components/AnnotatedWaveformCanvas";
 import API_BASE from "../../config/api";
+import { encodePcm16 } from "../../utils/pcm16";
 import "./RateOfSpeechAssessment.css";
 
 /**
@@ -126,7 +127,7 @@ const RateOfSpeechAssessment = () => {
       const arrayBuffer = await blob.arrayBuffer();
       const ac = new (window.AudioContext || window.webkitAudioContext)();
       const decoded = await ac.decodeAudioData(arrayBuffer);
-      let audioData = Array.from(decoded.getChannelData(0));
+      let audioData = decoded.getChannelData(0);
       let sampleRate = decoded.sampleRate;
       const originalLength = audioData.length;
 
@@ -147,7 +148,7 @@ const RateOfSpeechAssessment = () => {
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
           type,
-          audio_data: audioData,
+          audio_pcm16: encodePcm16(audioData),
           sample_rate: sampleRate,
           word_count: wordCount,
         }),
@@ -2,6 +2,7 @@ import React, { useState, useRef, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import AnnotatedWaveformCanvas from "../../components/AnnotatedWaveformCanvas";
 import API_BASE from "../../config/api";
+import { encodePcm16 } from "../../utils/pcm16";
 import "./RessonanceAndArticulationAssessment.css";
 
 /**
@@ -196,7 +197,7 @@ const RessonanceAndArticulationAssessment = () => {
       const arrayBuffer = await blob.arrayBuffer();
       const ac = new (window.AudioContext || window.webkitAudioContext)();
       const decoded = await ac.decodeAudioData(arrayBuffer);
-      const audioData = Array.from(decoded.getChannelData(0));
+      const audioData = decoded.getChannelData(0);
       const sampleRate = decoded.sampleRate;
 
       const response = await fetch(`${API_BASE}/api/analyze/amr?sound=${sound}`, {
@@ -204,7 +205,7 @@ const RessonanceAndArticulationAssessment = () => {
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
           sound,
-          audio_data: audioData,
+          audio_pcm16: encodePcm16(audioData),
           sample_rate: sampleRate,
         }),
       });
@@ -228,14 +229,14 @@ const RessonanceAndArticulationAssessment = () => {
       const arrayBuffer = await blob.arrayBuffer();
       const ac = new (window.AudioContext || window.webkitAudioContext)();
       const decoded = await ac.decodeAudioData(arrayBuffer);
-      const audioData = Array.from(decoded.getChannelData(0));
+      const audioData = decoded.getChannelData(0);
       const sampleRate = decoded.sampleRate;
 
       const response = await fetch(`${API_BASE}/api/analyze/smr`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
-          audio_data: audioData,
+          audio_pcm16: encodePcm16(audioData),
           sample_rate: sampleRate,
         }),
       });
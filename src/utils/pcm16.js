@@ -0,0 +1,32 @@
+/**
+ * PCM16 Upload Encoding
+ * Packs float samples as base64 little-endian int16 for the `audio_pcm16` request field,
+ * about 2.7 bytes per sample on the wire instead of ~20 for a JSON float array
+ */
+
+const PCM_SCALE = 32768;
+const CHUNK_BYTES = 0x8000;
+
+/**
+ * Encode float samples in [-1, 1] as base64 int16 PCM
+ * Uses the same scaling and clipping as the backend applies to `audio_data`
+ * @param {Float32Array|number[]} samples - Mono audio samples
+ * @returns {string} Base64 little-endian int16 PCM
+ */
+export function encodePcm16(samples) {
+  const bytes = new Uint8Array(samples.length * 2);
+  const view = new DataView(bytes.buffer);
+  for (let i = 0; i < samples.length; i++) {
+    const value = Math.round(samples[i] * (PCM_SCALE - 1));
+    view.setInt16(i * 2, Math.max(-PCM_SCALE, Math.min(PCM_SCALE - 1, value)), true);
+  }
+
+  // btoa needs a binary string; build it in chunks to stay under argument limits
+  let binary = "";
+  for (let start = 0; start < bytes.length; start += CHUNK_BYTES) {
+    binary += String.fromCharCode.apply(null, bytes.subarray(start, start + CHUNK_BYTES));
+  }
+  return btoa(binary);
+}
+
+export default encodePcm16;